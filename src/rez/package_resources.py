@@ -416,14 +416,14 @@ class PackageResourceHelper(PackageResource):
 
     def _convert_to_rex(self, commands):
         if isinstance(commands, list):
-            from rez.utils.backcompat import convert_old_commands
+            from rez.utils.backcompat import convert_old_commands_cached
 
             msg = "package %r is using old-style commands." % self.uri
             if config.disable_rez_1_compatibility or config.error_old_commands:
                 raise SchemaError(None, msg)
             elif config.warn("old_commands"):
                 print_warning(msg)
-            commands = convert_old_commands(commands)
+            commands = convert_old_commands_cached(commands)
 
         if isinstance(commands, basestring):
             return SourceCode(source=commands)
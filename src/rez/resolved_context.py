@@ -11,7 +11,7 @@ from rez.utils.sourcecode import SourceCodeError
 from rez.utils.colorize import critical, heading, local, implicit, Printer
 from rez.utils.formatting import columnise, PackageRequest, ENV_VAR_REGEX, \
     header_comment, minor_header_comment
-from rez.utils.data_utils import deep_del
+from rez.utils.data_utils import deep_del, cached_property
 from rez.utils.filesystem import TempDirs
 from rez.utils.memcached import pool_memcached_connections
 from rez.utils.logging_ import print_error
@@ -30,12 +30,16 @@ from rez.exceptions import ResolvedContextError, PackageCommandError, \
 from rez.utils.graph_utils import write_dot, write_compacted, read_graph_from_string
 from rez.vendor.six import six
 from rez.vendor.version.version import VersionRange
+from rez.vendor.pygraph.classes.digraph import digraph
 from rez.vendor.enum import Enum
 from rez.vendor import yaml
 from rez.utils import json
 from rez.utils.yaml import dump_yaml
 
+from collections import defaultdict
+from difflib import ndiff
 from functools import wraps
+import copy
 import getpass
 import socket
 import threading
@@ -158,7 +162,12 @@ class ResolvedContext(object):
 
         Args:
             package_requests: List of strings or PackageRequest objects
-                representing the request.
+                representing the request. Note that order is significant -
+                it determines the order in which package commands are
+                interpreted, so order is preserved when the request is passed
+                to the resolver (and used in its cache key). Implicit packages
+                that exactly duplicate a requested package are dropped before
+                solving.
             verbosity: Verbosity level. One of [0,1,2].
             timestamp: Ignore packages released after this epoch time. Packages
                 released at exactly this time will not be ignored.
@@ -274,7 +283,12 @@ class ResolvedContext(object):
                 package_load_callback(package)
             self.num_loaded_packages += 1
 
-        request = self.requested_packages(include_implicit=True)
+        # implicit packages that are also explicitly requested are redundant,
+        # so drop them from the solve (keeping order, which is significant).
+        # Compare strings, so eg implicit '!foo' is not dropped for '~foo'
+        explicit_strs = set(str(x) for x in self._package_requests)
+        request = self._package_requests + [
+            x for x in self.implicit_packages if str(x) not in explicit_strs]
 
         resolver = Resolver(context=self,
                             package_requests=request,
@@ -298,9 +312,14 @@ class ResolvedContext(object):
         self.solve_time = resolver.solve_time
         self.load_time = resolver.load_time
         self.failure_description = resolver.failure_description
-        self.graph_ = resolver.graph
         self.from_cache = resolver.from_cache
 
+        # avoid reading the graph if we already have it in compacted form, it
+        # is only read if requested (see `graph`)
+        self.graph_string = resolver.graph_string
+        if self.graph_string is None:
+            self.graph_ = resolver.graph
+
         if self.status_ == ResolverStatus.solved:
             self._resolved_packages = []
 
@@ -411,7 +430,6 @@ class ResolvedContext(object):
 
     def copy(self):
         """Returns a shallow copy of the context."""
-        import copy
         return copy.copy(self)
 
     # TODO: deprecate in favor of patch() method
@@ -537,7 +555,8 @@ class ResolvedContext(object):
 
         if self.graph_string:
             if self.graph_string.startswith('{'):  # compact format
-                self.graph_ = read_graph_from_string(self.graph_string)
+                if self.graph_ is None:
+                    self.graph_ = read_graph_from_string(self.graph_string)
             else:
                 # already in dot format. Note that this will only happen in
                 # old rez contexts where the graph is not stored in the newer
@@ -557,6 +576,9 @@ class ResolvedContext(object):
 
         if config.rxt_as_yaml:
             content = dump_yaml(doc)
+        elif config.rxt_compact_json:
+            # note that the C encoder is only used when indent is None
+            content = json.dumps(doc, separators=(",", ":"))
         else:
             content = json.dumps(doc, indent=4, separators=(",", ": "))
 
@@ -638,7 +660,6 @@ class ResolvedContext(object):
             difference between contexts.
         """
         if self.package_paths != other.package_paths:
-            from difflib import ndiff
             diff = ndiff(self.package_paths, other.package_paths)
             raise ResolvedContextError("Cannot diff resolves, package search "
                                        "paths differ:\n%s" % '\n'.join(diff))
@@ -705,7 +726,19 @@ class ResolvedContext(object):
                 'root' property listed, or their 'uri' if 'root' is None. Use
                 this option to list 'uri' regardless.
         """
-        _pr = Printer(buf)
+        printer = Printer(buf)
+        lines = []
+
+        def _pr(msg='', style=None):
+            lines.append(printer.get(msg, style))
+
+        def _write():
+            # write in one go, rather than printing and flushing per line
+            if lines:
+                buf.write('\n'.join(lines) + '\n')
+                del lines[:]
+                if hasattr(buf, 'flush'):
+                    buf.flush()
 
         def _rt(t):
             if verbosity:
@@ -717,6 +750,7 @@ class ResolvedContext(object):
         if self.status_ in (ResolverStatus.failed, ResolverStatus.aborted):
             _pr("The context failed to resolve:\n%s"
                 % self.failure_description, critical)
+            _write()
             return
 
         t_str = _rt(self.created)
@@ -731,8 +765,9 @@ class ResolvedContext(object):
             _pr("search paths:", heading)
             rows = []
             colors = []
+            local_packages_path = config.local_packages_path
             for path in self.package_paths:
-                if package_repository_manager.are_same(path, config.local_packages_path):
+                if package_repository_manager.are_same(path, local_packages_path):
                     label = "(local)"
                     col = local
                 else:
@@ -786,8 +821,7 @@ class ResolvedContext(object):
             pkg_root = pkg.root
 
             if is_current:
-                uname = pkg.name.upper().replace('.', '_')
-                prefix = "REZ_" + uname
+                prefix = self._package_var_prefixes[pkg.name]
                 if os.getenv(prefix + "_ORIG_ROOT"):
                     pkg_root = os.getenv(
                         prefix + "_ROOT",  # will point to cache
@@ -829,8 +863,11 @@ class ResolvedContext(object):
         if verbosity >= 2:
             _pr()
             _pr("tools:", heading)
+            _write()
             self.print_tools(buf=buf)
 
+        _write()
+
     def print_tools(self, buf=sys.stdout):
         data = self.get_tools()
         if not data:
@@ -936,8 +973,6 @@ class ResolvedContext(object):
         Returns:
             `pygraph.digraph` object.
         """
-        from rez.vendor.pygraph.classes.digraph import digraph
-
         nodes = {}
         edges = set()
         for variant in self._resolved_packages:
@@ -979,7 +1014,7 @@ class ResolvedContext(object):
         """
         interp = Python(target_environ={}, passive=True)
         executor = self._create_executor(interp, parent_environ)
-        self._execute(executor)
+        self._execute(executor, package_comments=False)
         return executor.get_output()
 
     @_on_success
@@ -1051,8 +1086,6 @@ class ResolvedContext(object):
         Returns:
             Dict of {tool-name: set([Variant])}.
         """
-        from collections import defaultdict
-
         tool_sets = defaultdict(set)
         tools_dict = self.get_tools(request_only=request_only)
         for variant, tools in tools_dict.values():
@@ -1112,7 +1145,7 @@ class ResolvedContext(object):
         """
         interpreter = Python(target_environ=os.environ)
         executor = self._create_executor(interpreter, parent_environ)
-        self._execute(executor)
+        self._execute(executor, package_comments=False)
         interpreter.apply_environ()
 
     @_on_success
@@ -1169,7 +1202,7 @@ class ResolvedContext(object):
         interpreter = Python(target_environ=target_environ)
 
         executor = self._create_executor(interpreter, parent_environ)
-        self._execute(executor)
+        self._execute(executor, package_comments=False)
         return interpreter.subprocess(args, **Popen_args)
 
     @_on_success
@@ -1207,7 +1240,7 @@ class ResolvedContext(object):
                       norc=False, stdin=False, command=None, quiet=False,
                       block=None, actions_callback=None, post_actions_callback=None,
                       context_filepath=None, start_new_session=False, detached=False,
-                      pre_command=None, **Popen_args):
+                      pre_command=None, save_rxt=True, **Popen_args):
         """Spawn a possibly-interactive shell.
 
         Args:
@@ -1245,6 +1278,11 @@ class ResolvedContext(object):
                 override the `pre_command` argument.
             pre_command: Command to inject before the shell command itself. This
                 is for internal use.
+            save_rxt (bool): If False, the context is not written to an rxt
+                file for the shell (unless it was loaded from one, in which
+                case that file is used). This avoids the cost of serializing
+                the context, but REZ_RXT_FILE will be unset, so tools that
+                rely on it (such as rez-context) will not work in the shell.
             Popen_args: args to pass to the shell process object constructor.
 
         Returns:
@@ -1277,16 +1315,22 @@ class ResolvedContext(object):
 
         if self.load_path and os.path.isfile(self.load_path):
             rxt_file = self.load_path
-        else:
+        elif save_rxt:
             rxt_file = os.path.join(tmpdir, "context.rxt")
             self.save(rxt_file)
+        else:
+            rxt_file = None
 
         context_file = context_filepath or \
             os.path.join(tmpdir, "context.%s" % sh.file_extension())
 
         # interpret this context and write out the native context (shell script) file
         executor = self._create_executor(sh, parent_environ)
-        executor.env.REZ_RXT_FILE = rxt_file
+        if rxt_file:
+            executor.env.REZ_RXT_FILE = rxt_file
+        elif executor.defined("REZ_RXT_FILE"):
+            # don't let the shell inherit a parent context's rxt file
+            executor.unsetenv("REZ_RXT_FILE")
         executor.env.REZ_CONTEXT_FILE = context_file
 
         if actions_callback:
@@ -1380,13 +1424,14 @@ class ResolvedContext(object):
             data["package_filter"] = self.package_filter.to_pod()
 
         if _add("graph"):
-            if self.graph_string and self.graph_string.startswith('{'):
-                graph_str = self.graph_string  # already in compact format
-            else:
+            if not (self.graph_string and self.graph_string.startswith('{')):
+                # store the compacted graph, so that it is only written once
+                # for contexts that are saved repeatedly (see `execute_shell`)
                 g = self.graph()
-                graph_str = write_compacted(g)
+                if g is not None:
+                    self.graph_string = write_compacted(g)
 
-            data["graph"] = graph_str
+            data["graph"] = self.graph_string
 
         data.update(dict(
             timestamp=self.timestamp,
@@ -1647,6 +1692,14 @@ class ResolvedContext(object):
             msg += " from %s" % path
         raise ResolvedContextError("%s: %s: %s" % (msg, exc_name, str(e)))
 
+    @cached_property
+    def _package_var_prefixes(self):
+        """Env-var prefix of each resolved package, eg 'REZ_FOO_BAH' for
+        package 'foo.bah'.
+        """
+        return dict((x.name, "REZ_" + x.name.upper().replace('.', '_'))
+                    for x in (self._resolved_packages or []))
+
     def _set_parent_suite(self, suite_path, context_name):
         self.parent_suite_path = suite_path
         self.suite_context_name = context_name
@@ -1671,7 +1724,14 @@ class ResolvedContext(object):
         return self.pre_resolve_bindings
 
     @pool_memcached_connections
-    def _execute(self, executor):
+    def _execute(self, executor, package_comments=True):
+        """Execute the context's commands.
+
+        Args:
+            executor (`RexExecutor`): Executor to run commands in.
+            package_comments (bool): If False, skip the per-package comments.
+                Set this when only the resulting environment is needed.
+        """
         # bind various info to the execution context
         resolved_pkgs = self.resolved_packages or []
         request_str = ' '.join(str(x) for x in self._package_requests)
@@ -1735,11 +1795,14 @@ class ResolvedContext(object):
                 if cached_root:
                     pkg_roots[pkg.name] = cached_root
 
-        # set basic package variables and create per-package bindings
-        bindings = {}
+        # set basic package variables
+        prefixes = self._package_var_prefixes
+
         for pkg in resolved_pkgs:
-            minor_header_comment(executor, "variables for package %s" % pkg.qualified_name)
-            prefix = "REZ_" + pkg.name.upper().replace('.', '_')
+            if package_comments:
+                minor_header_comment(executor, "variables for package %s"
+                                     % pkg.qualified_name)
+            prefix = prefixes[pkg.name]
 
             executor.setenv(prefix + "_VERSION", str(pkg.version))
             major_version = str(pkg.version[0] if len(pkg.version) >= 1 else '')
@@ -1758,10 +1821,10 @@ class ResolvedContext(object):
             else:
                 executor.setenv(prefix + "_ROOT", pkg.root)
 
-            bindings[pkg.name] = dict(version=VersionBinding(pkg.version),
-                                      variant=VariantBinding(pkg))
+        # commands. Per-package bindings are only created for packages that
+        # have commands, and are shared across pre/post/commands
+        bindings = {}
 
-        # commands
         for attr in ("pre_commands", "commands", "post_commands"):
             found = False
             for pkg in resolved_pkgs:
@@ -1772,8 +1835,15 @@ class ResolvedContext(object):
                     found = True
                     header_comment(executor, attr)
 
-                minor_header_comment(executor, "%s from package %s" % (attr, pkg.qualified_name))
-                bindings_ = bindings[pkg.name]
+                if package_comments:
+                    minor_header_comment(executor, "%s from package %s"
+                                         % (attr, pkg.qualified_name))
+                bindings_ = bindings.get(pkg.name)
+                if bindings_ is None:
+                    bindings_ = dict(version=VersionBinding(pkg.version),
+                                     variant=VariantBinding(pkg))
+                    bindings[pkg.name] = bindings_
+
                 executor.bind('this',       bindings_["variant"])
                 executor.bind("version",    bindings_["version"])
                 executor.bind('root',       pkg_roots.get(pkg.name, pkg.root))
@@ -4,13 +4,19 @@ from rez.packages import get_variant, get_last_release_time
 from rez.package_filter import PackageFilterList, TimestampRule
 from rez.utils.memcached import memcached_client, pool_memcached_connections
 from rez.utils.logging_ import log_duration
+from rez.utils.graph_utils import write_compacted, read_graph_from_string
 from rez.config import config
 from rez.vendor.enum import Enum
+from rez.vendor.six import six
 from contextlib import contextmanager
 from hashlib import sha1
+import threading
 import os
 
 
+basestring = six.string_types[0]
+
+
 class ResolverStatus(Enum):
     """ Enum to represent the current state of a resolver instance.  The enum
     also includes a human readable description of what the state represents.
@@ -31,6 +37,15 @@ class Resolver(object):
     The Resolver uses a combination of Solver(s) and cache(s) to resolve a
     package request as quickly as possible.
     """
+
+    # Process-local copies of memcached resolve entries. These are validated in
+    # exactly the same way as memcached entries, but mean that a resolve
+    # repeated within the same process does not need a memcached roundtrip,
+    # and is not lost if the memcached server becomes unavailable.
+    local_cache = {}
+    local_cache_max_entries = 64
+    local_cache_lock = threading.Lock()
+
     def __init__(self, context, package_requests, package_paths, package_filter=None,
                  package_orderers=None, timestamp=0, callback=None, building=False,
                  verbosity=False, buf=None, package_load_callback=None, caching=True,
@@ -150,8 +165,25 @@ class Resolver(object):
         Returns:
             A pygraph.digraph object, or None if the solve has not completed.
         """
+        if isinstance(self.graph_, basestring):
+            # cached solves store the graph in our compacted format
+            self.graph_ = read_graph_from_string(self.graph_)
         return self.graph_
 
+    @property
+    def graph_string(self):
+        """Return the resolve graph in compacted string form, if available.
+
+        This is only available for solves retrieved from cache, and avoids the
+        cost of reading the graph when it isn't needed.
+
+        Returns:
+            str: Compacted graph string, or None.
+        """
+        if isinstance(self.graph_, basestring):
+            return self.graph_
+        return None
+
     def _get_variant(self, variant_handle):
         return get_variant(variant_handle, context=self.context)
 
@@ -195,6 +227,9 @@ class Resolver(object):
         reused if the timestamp matches exactly (but this might happen a lot -
         consider a workflow where a work area is tied down to a particular
         timestamp in order to 'lock' it from any further software releases).
+
+        Entries are looked up in the process-local cache (see `local_cache`)
+        before memcached.
         """
         if not (self.caching and self.memcached_servers):
             return None
@@ -212,15 +247,26 @@ class Resolver(object):
             return None
 
         def _delete_cache_entry(key):
+            with self.local_cache_lock:
+                self.local_cache.pop(key, None)
             with self._memcached_client() as client:
                 client.delete(key)
             self._print("Discarded entry: %r", key)
 
         def _retrieve(timestamped):
             key = self._memcache_key(timestamped=timestamped)
+
+            data = self.local_cache.get(key)
+            if data is not None:
+                self._print("Retrieved local cache key: %r", key)
+                return key, data
+
             self._print("Retrieving memcache key: %r", key)
             with self._memcached_client() as client:
                 data = client.get(key)
+
+            if data:
+                self._set_local_cache_entry(key, data)
             return key, data
 
         def _packages_changed(key, data):
@@ -348,13 +394,30 @@ class Resolver(object):
             variant_states_dict[variant.name] = \
                 repo.get_variant_state_handle(variant.resource)
 
+        # store the graph in our compacted format. This pickles far smaller
+        # than a digraph object, so cache entries are cheaper to send and load
+        graph_ = solver_dict.get("graph")
+        if graph_ is not None and not isinstance(graph_, basestring):
+            solver_dict = solver_dict.copy()
+            solver_dict["graph"] = write_compacted(graph_)
+
         timestamped = (self.timestamp and releases_since_solve)
         key = self._memcache_key(timestamped=timestamped)
         data = (solver_dict, release_times_dict, variant_states_dict)
+        self._set_local_cache_entry(key, data)
         with self._memcached_client() as client:
             client.set(key, data)
         self._print("Sent memcache key: %r", key)
 
+    @classmethod
+    def _set_local_cache_entry(cls, key, data):
+        # resolves may run in multiple threads (eg rez-gui)
+        with cls.local_cache_lock:
+            if len(cls.local_cache) >= cls.local_cache_max_entries \
+                    and key not in cls.local_cache:
+                cls.local_cache.pop(next(iter(cls.local_cache)), None)
+            cls.local_cache[key] = data
+
     def _memcache_key(self, timestamped=False):
         """Makes a key suitable as a memcache entry."""
         request = tuple(map(str, self.package_requests))
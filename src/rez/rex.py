@@ -7,6 +7,7 @@ import pipes
 import re
 import inspect
 import traceback
+import types
 from contextlib import contextmanager
 from string import Formatter
 
@@ -21,6 +22,7 @@ from rez.utils.sourcecode import SourceCode, SourceCodeError
 from rez.utils.data_utils import AttrDictWrapper
 from rez.utils.formatting import expandvars
 from rez.utils.platform_ import platform_
+from rez.backport.lru_cache import lru_cache
 from rez.vendor.enum import Enum
 from rez.vendor.six import six
 
@@ -1270,8 +1272,13 @@ class RexExecutor(object):
     def compile_code(cls, code, filename=None, exec_namespace=None):
         """Compile and possibly execute rex code.
 
+        Compilation of string code is cached, so executing the same code
+        repeatedly (for example, once per context execution) only compiles it
+        once.
+
         Args:
-            code (str or SourceCode): The python code to compile.
+            code (str or SourceCode or code object): The python code to
+                compile. Code objects are used as-is.
             filename (str): File to associate with the code, will default to
                 '<string>'.
             exec_namespace (dict): Namespace to execute the code in. If None,
@@ -1283,6 +1290,8 @@ class RexExecutor(object):
         if filename is None:
             if isinstance(code, SourceCode):
                 filename = code.sourcename
+            elif isinstance(code, types.CodeType):
+                filename = code.co_filename
             else:
                 filename = "<string>"
 
@@ -1290,8 +1299,10 @@ class RexExecutor(object):
         try:
             if isinstance(code, SourceCode):
                 pyc = code.compiled
+            elif isinstance(code, types.CodeType):
+                pyc = code
             else:
-                pyc = compile(code, filename, 'exec')
+                pyc = _compile_code(code, filename)
         except SourceCodeError as e:
             reraise(e, RexError)
         except Exception as e:
@@ -1321,7 +1332,7 @@ class RexExecutor(object):
         """Execute code within the execution context.
 
         Args:
-            code (str or SourceCode): Rex code to execute.
+            code (str or SourceCode or code object): Rex code to execute.
             filename (str): Filename to report if there are syntax errors.
             isolate (bool): If True, do not affect `self.globals` by executing
                 this code. DEPRECATED - use `self.reset_globals` instead.
@@ -1373,6 +1384,11 @@ class RexExecutor(object):
         return self.formatter.format(str(value), regex=self.interpreter.ENV_VAR_REGEX)
 
 
+@lru_cache(maxsize=256)
+def _compile_code(code, filename):
+    return compile(code, filename, 'exec')
+
+
 # Copyright 2013-2016 Allan Johns.
 #
 # This library is free software: you can redistribute it and/or
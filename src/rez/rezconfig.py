@@ -843,6 +843,13 @@ max_package_changelog_chars = 65536
 # If not zero, truncates all package changelogs to only show the last N commits
 max_package_changelog_revisions = 0
 
+# If this is true, rxt files written in json format are written compactly (no
+# indentation or extra whitespace). This is faster, since python's C json
+# encoder is only used when no indentation is applied, and also results in
+# smaller rxt files - but they are no longer readable by eye. Note that this
+# setting has no effect if 'rxt_as_yaml' is true.
+rxt_compact_json = False
+
 # Default option on how to create scripts with util.create_executable_script.
 # In order to support both windows and other OS it is recommended to set this
 # to 'both'.
@@ -4,12 +4,17 @@ test resolved contexts
 from rez.tests.util import restore_os_environ, restore_sys_path, TempdirMixin, \
     TestBase
 from rez.resolved_context import ResolvedContext
+from rez.resolver import Resolver
+from rez.rex import Comment, Unsetenv
 from rez.bind import hello_world
 from rez.utils.platform_ import platform_
+from rez.vendor.six.six.moves import StringIO
+from contextlib import contextmanager
 import unittest
 import subprocess
 import os.path
 import os
+import shutil
 
 
 class TestContext(TestBase, TempdirMixin):
@@ -40,6 +45,128 @@ class TestContext(TestBase, TempdirMixin):
         r = ResolvedContext(["hello_world"])
         r.print_info()
 
+    def test_print_info_missing_root(self):
+        """Test that print_info does not cache variant root existence."""
+        packages_path = os.path.join(self.root, "packages_print_info")
+        os.makedirs(packages_path)
+        hello_world.bind(packages_path)
+        r = ResolvedContext(["hello_world"], package_paths=[packages_path])
+
+        buf = StringIO()
+        r.print_info(buf=buf)
+        self.assertNotIn("NOT FOUND", buf.getvalue())
+
+        shutil.rmtree(r.resolved_packages[0].root)
+        buf = StringIO()
+        r.print_info(buf=buf)
+        self.assertIn("NOT FOUND", buf.getvalue())
+
+    def test_implicit_packages_dedup(self):
+        """Test that implicit packages already requested are not re-solved."""
+        import rez.resolved_context
+        solved_requests = []
+
+        class _Resolver(Resolver):
+            def __init__(self, context, package_requests, *nargs, **kwargs):
+                solved_requests.append([str(x) for x in package_requests])
+                super(_Resolver, self).__init__(
+                    context, package_requests, *nargs, **kwargs)
+
+        self.update_settings(dict(
+            implicit_packages=["hello_world", "!bah", "~foo"]))
+        rez.resolved_context.Resolver = _Resolver
+        try:
+            r = ResolvedContext(["hello_world", "~bah", "hello_world"])
+        finally:
+            rez.resolved_context.Resolver = Resolver
+
+        # only the implicit duplicate is dropped from the solve. The explicit
+        # request is left as is, and order is kept
+        self.assertEqual(solved_requests,
+                         [["hello_world", "~bah", "hello_world", "!bah", "~foo"]])
+
+        # but is still reported in the request
+        self.assertEqual([str(x) for x in r.requested_packages(True)],
+                         ["hello_world", "~bah", "hello_world",
+                          "hello_world", "!bah", "~foo"])
+        self.assertEqual([x.name for x in r.resolved_packages],
+                         ["hello_world"])
+
+    def test_resolve_local_cache(self):
+        """Test the process-local cache of memcached resolves."""
+        class FakeClient(object):
+            def __init__(self):
+                self.data = {}
+                self.calls = []
+
+            def get(self, key):
+                self.calls.append("get")
+                return self.data.get(key)
+
+            def set(self, key, value):
+                self.calls.append("set")
+                self.data[key] = value
+
+            def delete(self, key):
+                self.calls.append("delete")
+                self.data.pop(key, None)
+
+        client = FakeClient()
+
+        @contextmanager
+        def _memcached_client(self_):
+            yield client
+
+        self.update_settings(dict(resolve_caching=True,
+                                  memcached_uri=["127.0.0.1:11211"]))
+        memcached_client_ = Resolver._memcached_client
+        local_cache = Resolver.local_cache
+        max_entries = Resolver.local_cache_max_entries
+        Resolver._memcached_client = _memcached_client
+        Resolver.local_cache = {}
+
+        try:
+            # miss, solve is stored in memcached and the local cache
+            r = ResolvedContext(["hello_world"])
+            self.assertFalse(r.from_cache)
+            self.assertEqual(client.calls, ["get", "set"])
+            self.assertEqual(len(Resolver.local_cache), 1)
+
+            # local hit, memcached is not queried
+            client.calls = []
+            r = ResolvedContext(["hello_world"])
+            self.assertTrue(r.from_cache)
+            self.assertEqual(client.calls, [])
+
+            # memcached hit fills the local cache
+            Resolver.local_cache.clear()
+            r = ResolvedContext(["hello_world"])
+            self.assertTrue(r.from_cache)
+            self.assertEqual(client.calls, ["get"])
+            self.assertEqual(len(Resolver.local_cache), 1)
+
+            # stale entry is discarded from both caches, then re-solved
+            key, (solver_dict, release_times, _) = \
+                next(iter(Resolver.local_cache.items()))
+            Resolver.local_cache[key] = \
+                (solver_dict, release_times, {"hello_world": None})
+            client.calls = []
+            r = ResolvedContext(["hello_world"])
+            self.assertFalse(r.from_cache)
+            self.assertEqual(client.calls, ["delete", "set"])
+            self.assertEqual(len(client.data), 1)
+            self.assertNotEqual(Resolver.local_cache[key][2],
+                                {"hello_world": None})
+
+            # eviction when full
+            Resolver.local_cache_max_entries = 1
+            Resolver._set_local_cache_entry("foo", 1)
+            self.assertEqual(Resolver.local_cache, {"foo": 1})
+        finally:
+            Resolver._memcached_client = memcached_client_
+            Resolver.local_cache = local_cache
+            Resolver.local_cache_max_entries = max_entries
+
     def test_apply(self):
         """Test apply() function."""
         # Isolate our changes to os.environ and sys.path and return to the
@@ -49,6 +176,16 @@ class TestContext(TestBase, TempdirMixin):
             r.apply()
             self.assertEqual(os.environ.get("OH_HAI_WORLD"), "hello")
 
+    def test_get_actions(self):
+        """Test that get_actions() includes per-package comments."""
+        r = ResolvedContext(["hello_world"])
+        comments = [x.args[0] for x in r.get_actions()
+                    if isinstance(x, Comment)]
+
+        self.assertTrue(any("commands from package hello_world" in x
+                            for x in comments))
+        self.assertEqual(r.get_environ().get("OH_HAI_WORLD"), "hello")
+
     # TODO make shell-dependent (wait until port to pytest)
     def test_execute_command(self):
         """Test command execution in context."""
@@ -82,6 +219,31 @@ class TestContext(TestBase, TempdirMixin):
 
         self.assertEqual(parts, ["covfefe", "hello"])
 
+    def test_execute_shell_save_rxt(self):
+        """Test that execute_shell only writes an rxt file if required."""
+        r = ResolvedContext(["hello_world"])
+        rxt_files = []
+        rxt_unset = []
+
+        def _actions_callback(executor):
+            rxt_files.append(executor.manager.environ.get("REZ_RXT_FILE"))
+            rxt_unset.append(Unsetenv("REZ_RXT_FILE") in executor.actions)
+
+        # a parent context's rxt file must not leak into the shell, but it is
+        # only unset if actually inherited
+        for parent_environ in ({"REZ_RXT_FILE": "/outer/context.rxt"}, {}):
+            for save_rxt in (True, False):
+                r.execute_shell(command='', save_rxt=save_rxt,
+                                parent_environ=parent_environ,
+                                post_actions_callback=_actions_callback,
+                                stdout=subprocess.PIPE)
+
+        self.assertTrue(os.path.isfile(rxt_files[0]))
+        self.assertEqual(rxt_files[1], None)
+        self.assertTrue(os.path.isfile(rxt_files[2]))
+        self.assertEqual(rxt_files[3], None)
+        self.assertEqual(rxt_unset, [False, True, False, False])
+
     def test_serialize(self):
         """Test context serlialzation."""
 
@@ -98,6 +260,33 @@ class TestContext(TestBase, TempdirMixin):
         env = r2.get_environ()
         self.assertEqual(env.get("OH_HAI_WORLD"), "hello")
 
+    def test_serialize_formats(self):
+        """Test context serialization in each rxt format."""
+        r = ResolvedContext(["hello_world"])
+        file = os.path.join(self.root, "test_formats.rxt")
+
+        def _read():
+            with open(file) as f:
+                return f.read()
+
+        for settings in (dict(rxt_as_yaml=False, rxt_compact_json=True),
+                         dict(rxt_as_yaml=False, rxt_compact_json=False),
+                         dict(rxt_as_yaml=True)):
+            self.update_settings(settings)
+            r.save(file)
+
+            content = _read()
+            if settings.get("rxt_compact_json"):
+                self.assertNotIn('\n', content)
+                self.assertIn('"serialize_version":"', content)
+            elif settings.get("rxt_compact_json") is False:
+                self.assertIn('\n    "serialize_version": "', content)
+
+            r2 = ResolvedContext.load(file)
+            self.assertEqual(r.resolved_packages, r2.resolved_packages)
+            self.assertEqual(r.requested_packages(True),
+                             r2.requested_packages(True))
+
 
 if __name__ == '__main__':
     unittest.main()
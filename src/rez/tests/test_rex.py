@@ -10,8 +10,10 @@ from rez.config import config
 import unittest
 from rez.vendor.version.version import Version
 from rez.tests.util import TestBase
-from rez.utils.backcompat import convert_old_commands
+from rez.utils.backcompat import convert_old_commands, \
+    convert_old_commands_cached
 import inspect
+import logging
 import textwrap
 import os
 
@@ -27,7 +29,8 @@ class TestRex(TestBase):
 
     def _test(self, func, env, expected_actions=None, expected_output=None,
               expected_exception=None, **ex_kwargs):
-        """Tests rex code as a function object, and code string."""
+        """Tests rex code as a function object, code string, and compiled
+        code object."""
         loc = inspect.getsourcelines(func)[0][1:]
         code = textwrap.dedent('\n'.join(loc))
 
@@ -48,6 +51,12 @@ class TestRex(TestBase):
             self.assertEqual(ex.actions, expected_actions)
             self.assertEqual(ex.get_output(), expected_output)
 
+            # test precompiled code object
+            ex = self._create_executor(env, **ex_kwargs)
+            ex.execute_code(RexExecutor.compile_code(code))
+            self.assertEqual(ex.actions, expected_actions)
+            self.assertEqual(ex.get_output(), expected_output)
+
     def test_1(self):
         """Test simple use of every available action."""
         def _rex():
@@ -407,6 +416,44 @@ class TestRex(TestBase):
                                             annotate=False)
         self.assertEqual(rez_commands, expected)
 
+        expected = "prependenv('PATH', '{root}/bin/{version.major}')"
+        rez_commands = convert_old_commands(
+            ["export PATH=!ROOT!/bin/!MAJOR_VERSION!:$PATH"], annotate=False)
+        self.assertEqual(rez_commands, expected)
+
+        expected = "setenv('A', '{system.user}:!FOO!')"
+        rez_commands = convert_old_commands(["export A=!USER!:!FOO!"],
+                                            annotate=False)
+        self.assertEqual(rez_commands, expected)
+
+        # cached conversion gives the same result, on first and later calls
+        commands = ["export A=$A:B", "alias foo='bah'", "echo !VERSION!"]
+        expected = convert_old_commands(commands)
+        self.assertEqual(convert_old_commands_cached(commands), expected)
+        self.assertEqual(convert_old_commands_cached(commands), expected)
+
+        # debug output is printed on cache hits too
+        class _Handler(logging.Handler):
+            def emit(self, record):
+                messages.append(record.getMessage())
+
+        messages = []
+        handler = _Handler()
+        logger = logging.getLogger("rez.utils.logging_")
+        level = logger.level
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+        self.update_settings(dict(debug_old_commands=True))
+
+        try:
+            convert_old_commands_cached(commands)
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(level)
+
+        self.assertEqual(len(messages), 1)
+        self.assertIn("OLD COMMANDS:", messages[0])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,6 +4,7 @@ unit tests for 'utils.filesystem' module
 import os
 from rez.tests.util import TestBase
 from rez.utils import filesystem
+from rez.utils.formatting import columnise
 from rez.utils.platform_ import Platform, platform_
 
 
@@ -46,6 +47,17 @@ class TestCanonicalPath(TestBase):
         self.assertEqual(path, expects)
 
 
+class TestColumnise(TestBase):
+    def test_columnise(self):
+        rows = [("foo-1.0", "/a/b", ""),
+                ("bah", "/c", "(local)")]
+        expects = ["foo-1.0  /a/b  ",
+                   "bah      /c    (local)"]
+
+        self.assertEqual(columnise(rows), expects)
+        self.assertEqual(columnise(x for x in rows), expects)
+
+
 # Copyright 2013-2016 Allan Johns.
 #
 # This library is free software: you can redistribute it and/or
@@ -128,16 +128,22 @@ def _atexit():
         pass
 
 
+if six.PY2:
+    _iterable_class = collections.Iterable
+else:
+    import collections.abc
+    _iterable_class = collections.abc.Iterable
+
+
 def is_non_string_iterable(arg):
     """Python 2 and 3 compatible non-string iterable identifier"""
 
-    if six.PY2:
-        iterable_class = collections.Iterable
-    else:
-        iterable_class = collections.abc.Iterable
+    # fast path for the common case, avoids the ABC instance check
+    if isinstance(arg, (list, tuple)):
+        return True
 
     return (
-        isinstance(arg, iterable_class)
+        isinstance(arg, _iterable_class)
         and not isinstance(arg, six.string_types)
     )
 
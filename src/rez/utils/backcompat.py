@@ -3,6 +3,7 @@ Utility code for supporting earlier Rez data in later Rez releases.
 """
 from rez.config import config
 from rez.utils.logging_ import print_debug
+from rez.backport.lru_cache import lru_cache
 import re
 import os
 import os.path
@@ -37,15 +38,24 @@ def convert_old_variant_handle(handle_dict):
     return dict(key=key, variables=variables)
 
 
+old_command_expansions = {
+    "VERSION":          "{version}",
+    "MAJOR_VERSION":    "{version.major}",
+    "MINOR_VERSION":    "{version.minor}",
+    "BASE":             "{base}",
+    "ROOT":             "{root}",
+    "USER":             "{system.user}"
+}
+
+
+old_command_expansion_regex = re.compile(
+    "!(%s)!" % '|'.join(old_command_expansions.keys()))
+
+
 def convert_old_command_expansions(command):
     """Convert expansions from !OLD! style to {new}."""
-    command = command.replace("!VERSION!",       "{version}")
-    command = command.replace("!MAJOR_VERSION!", "{version.major}")
-    command = command.replace("!MINOR_VERSION!", "{version.minor}")
-    command = command.replace("!BASE!",          "{base}")
-    command = command.replace("!ROOT!",          "{root}")
-    command = command.replace("!USER!",          "{system.user}")
-    return command
+    return old_command_expansion_regex.sub(
+        lambda m: old_command_expansions[m.group(1)], command)
 
 
 within_unescaped_quotes_regex = re.compile('(?<!\\\\)"(.*?)(?<!\\\\)"')
@@ -53,9 +63,12 @@ within_unescaped_quotes_regex = re.compile('(?<!\\\\)"(.*?)(?<!\\\\)"')
 
 def convert_old_commands(commands, annotate=True):
     """Converts old-style package commands into equivalent Rex code."""
-    from rez.config import config
-    from rez.utils.logging_ import print_debug
+    rex_code = _convert_old_commands_to_rex(commands, annotate)
+    _print_old_commands_debug(commands, rex_code)
+    return rex_code
+
 
+def _convert_old_commands_to_rex(commands, annotate):
     def _repl(s):
         return s.replace('\\"', '"')
 
@@ -149,7 +162,10 @@ def convert_old_commands(commands, annotate=True):
             # if anything goes wrong, just fall back to bash command
             loc.append("command(%s)" % _encode(cmd))
 
-    rex_code = '\n'.join(loc)
+    return '\n'.join(loc)
+
+
+def _print_old_commands_debug(commands, rex_code):
     if config.debug("old_commands"):
         br = '-' * 80
         msg = textwrap.dedent(
@@ -163,9 +179,27 @@ def convert_old_commands(commands, annotate=True):
             %s
             """) % (br, '\n'.join(commands), rex_code, br)
         print_debug(msg)
+
+
+def convert_old_commands_cached(commands, annotate=True):
+    """Memoized version of `convert_old_commands`.
+
+    Conversion is pure with respect to the commands and the configured env-var
+    separators, so the result is reused when the same package's commands are
+    converted again (for example after resource caches are cleared). Debug
+    output (see `debug_old_commands`) is still printed on every call.
+    """
+    separators = tuple(sorted(config.env_var_separators.items()))
+    rex_code = _convert_old_commands(tuple(commands), annotate, separators)
+    _print_old_commands_debug(commands, rex_code)
     return rex_code
 
 
+@lru_cache(maxsize=1024)
+def _convert_old_commands(commands, annotate, separators):
+    return _convert_old_commands_to_rex(list(commands), annotate)
+
+
 # Copyright 2013-2016 Allan Johns.
 #
 # This library is free software: you can redistribute it and/or
@@ -291,27 +291,28 @@ def dict_to_attributes_code(dict_):
 
 
 def columnise(rows, padding=2):
-    """Print rows of entries in aligned columns."""
-    strs = []
-    maxwidths = {}
+    """Print rows of entries in aligned columns.
+
+    `rows` may be any iterable, including a generator; it is only consumed once.
+    """
+    rows = [[str(e) for e in row] for row in rows]
+    maxwidths = []
 
     for row in rows:
-        for i, e in enumerate(row):
-            se = str(e)
+        for i, se in enumerate(row):
             nse = len(se)
-            w = maxwidths.get(i, -1)
-            if nse > w:
+            if i == len(maxwidths):
+                maxwidths.append(nse)
+            elif nse > maxwidths[i]:
                 maxwidths[i] = nse
 
+    strs = []
     for row in rows:
-        s = ''
-        for i, e in enumerate(row):
-            se = str(e)
-            if i < len(row) - 1:
-                n = maxwidths[i] + padding - len(se)
-                se += ' ' * n
-            s += se
-        strs.append(s)
+        last = len(row) - 1
+        strs.append(''.join(
+            (se if i == last else se.ljust(maxwidths[i] + padding))
+            for i, se in enumerate(row)
+        ))
     return strs
 
 